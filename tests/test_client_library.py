@@ -194,6 +194,20 @@ def test_auth_and_reauth_token(client_library_server_current):
     assert respx.calls.call_count == 6
 
 
+def test_client_library_definitions_cache(client_library_server_current):
+    cl = ClientLibrary("https://somehost", "virl2", "virl2")
+    assert cl.definitions.cache_size == 0
+    cl = ClientLibrary(
+        "https://somehost",
+        "virl2",
+        "virl2",
+        definitions_cache_size=64,
+        definitions_cache_ttl=30,
+    )
+    assert cl.definitions.cache_size == 64
+    assert cl.definitions.cache_ttl == 30
+
+
 def test_client_library_init_allow_http(client_library_server_current):
     cl = ClientLibrary("http://somehost", "virl2", "virl2", allow_http=True)
     assert cl._session.base_url.scheme == "http"
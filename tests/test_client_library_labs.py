@@ -18,12 +18,15 @@
 # limitations under the License.
 #
 
-from unittest.mock import MagicMock, Mock
+import asyncio
+import threading
+import time
+from unittest.mock import MagicMock, Mock, call, patch
 
 import pytest
 
 from virl2_client.exceptions import NodeNotFound
-from virl2_client.models import Interface, Lab
+from virl2_client.models import Interface, Lab, Link, Node
 from virl2_client.models.authentication import make_session
 
 RESOURCE_POOL_MANAGER = Mock()
@@ -264,6 +267,15 @@ def test_tags():
     node_a.remove_tag("Test")
     assert len(node_a.tags()) == 2
 
+    # local tags only change once the server accepted the update
+    session.patch.side_effect = RuntimeError
+    with pytest.raises(RuntimeError):
+        node_a.add_tag("Asia")
+    with pytest.raises(RuntimeError):
+        node_a.remove_tag("Core")
+    assert node_a.tags() == ["Core", "Europe"]
+    session.patch.side_effect = None
+
     node_b.add_tag("Core")
     node_c.add_tag("Core")
     node_d.add_tag("Europe")
@@ -349,3 +361,395 @@ def test_all_labs(client_library):
     lab: Lab = iosv_labs[0]
     node = lab.get_node_by_label("csr1000v-0")
     assert node.compute_id == "99c887f5-052e-4864-a583-49fa7c4b68a9"
+
+
+def test_node_batched_updates():
+    session = MagicMock()
+    username = password = "test"
+    lab = Lab(
+        "laboratory",
+        "1",
+        session,
+        username,
+        password,
+        auto_sync=0,
+        resource_pool_manager=RESOURCE_POOL_MANAGER,
+    )
+    node = lab._create_node_local("0", "node A", "nd", "im", "cfg", 0, 0)
+
+    with node.batched_updates():
+        node.label = "node B"
+        node.x = 100
+        node.y = 200
+        node.x = 150
+        session.patch.assert_not_called()
+        assert node.x == 150
+
+    session.patch.assert_called_once_with(
+        "labs/1/nodes/0?exclude_configurations=false",
+        json={"label": "node B", "x": 150, "y": 200},
+    )
+    assert node._pending.properties is None
+
+    session.patch.reset_mock()
+    node.ram = 2048
+    session.patch.assert_called_once_with(
+        "labs/1/nodes/0?exclude_configurations=false", json={"ram": 2048}
+    )
+
+    session.patch.reset_mock()
+    node.configuration = "hostname a"
+    session.patch.reset_mock()
+    with pytest.raises(RuntimeError):
+        with node.batched_updates():
+            node.label = "node C"
+            node.label = "node D"
+            node.configuration = "hostname b"
+            raise RuntimeError
+    session.patch.assert_not_called()
+    assert node._pending.properties is None
+    assert node.label == "node B"
+    assert node.configuration == "hostname a"
+
+    # changes made by other threads are not deferred by the block
+    session.patch.reset_mock()
+    with node.batched_updates():
+        thread = threading.Thread(target=setattr, args=(node, "ram", 4096))
+        thread.start()
+        thread.join()
+        session.patch.assert_called_once_with(
+            "labs/1/nodes/0?exclude_configurations=false", json={"ram": 4096}
+        )
+        node.x = 10
+    assert session.patch.call_args == call(
+        "labs/1/nodes/0?exclude_configurations=false", json={"x": 10}
+    )
+
+
+def test_node_interface_index():
+    session = MagicMock()
+    username = password = "test"
+    lab = Lab(
+        "laboratory",
+        "1",
+        session,
+        username,
+        password,
+        auto_sync=0,
+        resource_pool_manager=RESOURCE_POOL_MANAGER,
+    )
+    node_a = lab._create_node_local("0", "node A", "nd", "im", "cfg", 0, 0)
+    node_b = lab._create_node_local("1", "node B", "nd", "im", "cfg", 1, 1)
+    i1 = lab._create_interface_local("0", "iface A0", node_a, 0)
+    i2 = lab._create_interface_local("1", "iface A1", node_a, 1)
+    i3 = lab._create_interface_local("2", "iface B0", node_b, 0)
+
+    assert node_a.interfaces() == [i1, i2]
+    assert node_b.interfaces() == [i3]
+    assert list(node_a.iter_interfaces()) == [i1, i2]
+    assert node_a.get_interface_by_slot(1) is i2
+    assert node_b.get_interface_by_label("iface B0") is i3
+
+    # an existing interface that is reassigned moves between nodes
+    lab._create_interface_local("1", "iface B1", node_b, 1)
+    assert node_a.interfaces() == [i1]
+    assert node_b.interfaces() == [i3, i2]
+
+    lab.remove_interface(i3)
+    assert node_b.interfaces() == [i2]
+
+    lab.remove_node(node_b)
+    assert "1" not in lab._node_interfaces
+    assert node_a.interfaces() == [i1]
+    assert lab.interfaces() == [i1]
+
+
+def test_node_wait_until_converged_backoff():
+    session = MagicMock()
+    username = password = "test"
+    lab = Lab(
+        "laboratory",
+        "1",
+        session,
+        username,
+        password,
+        auto_sync=0,
+        resource_pool_manager=RESOURCE_POOL_MANAGER,
+    )
+    node = lab._create_node_local("0", "node A", "nd", "im", "cfg", 0, 0)
+    converged = [False] * 5 + [True]
+    with patch.object(Node, "has_converged", side_effect=converged), patch.object(
+        Lab, "_wait_for_state_change"
+    ) as wait:
+        node.wait_until_converged(max_iterations=10, wait_time=1)
+    assert wait.call_args_list == [
+        call(node, 0.1),
+        call(node, 0.2),
+        call(node, 0.4),
+        call(node, 0.8),
+        call(node, 1),
+    ]
+
+    with patch.object(Node, "has_converged", return_value=False), patch.object(
+        Lab, "_wait_for_state_change"
+    ):
+        with pytest.raises(
+            RuntimeError, match=r"maximum tries 3 exceeded \(3 checks in 0 seconds\)"
+        ):
+            node.wait_until_converged(max_iterations=3, wait_time=0)
+
+    node_b = lab._create_node_local("1", "node B", "nd", "im", "cfg", 1, 1)
+    iface_a = lab._create_interface_local("0", "iface A0", node, 0)
+    iface_b = lab._create_interface_local("1", "iface B0", node_b, 0)
+    link = lab._create_link_local(iface_a, iface_b, "0")
+    with patch.object(Link, "has_converged", side_effect=[False, False, True]), patch(
+        "virl2_client.models.link.time.sleep"
+    ) as sleep:
+        link.wait_until_converged(max_iterations=10, wait_time=1)
+    assert sleep.call_args_list == [call(0.1), call(0.2)]
+
+
+def test_node_async_state_actions():
+    session = MagicMock()
+    session.get.return_value.json.return_value = True
+    username = password = "test"
+    lab = Lab(
+        "laboratory",
+        "1",
+        session,
+        username,
+        password,
+        auto_sync=0,
+        resource_pool_manager=RESOURCE_POOL_MANAGER,
+    )
+    nodes = [
+        lab._create_node_local(str(i), f"node {i}", "nd", "im", "cfg", 0, 0)
+        for i in range(3)
+    ]
+
+    async def start_all():
+        await asyncio.gather(*(node.start_async(wait=True) for node in nodes))
+
+    asyncio.run(start_all())
+    assert sorted(c.args[0] for c in session.put.call_args_list) == [
+        f"labs/1/nodes/{i}/state/start" for i in range(3)
+    ]
+    assert session.get.call_count == 3
+    assert asyncio.run(nodes[0].has_converged_async()) is True
+    assert nodes[0]._url_for("start") is nodes[0]._url_for("start")
+    assert nodes[0]._url_for("console_log", console_id=1) == (
+        "labs/1/nodes/0/consoles/1/log"
+    )
+
+
+def test_interface_link_index():
+    session = MagicMock()
+    username = password = "test"
+    lab = Lab(
+        "laboratory",
+        "1",
+        session,
+        username,
+        password,
+        auto_sync=0,
+        resource_pool_manager=RESOURCE_POOL_MANAGER,
+    )
+    node_a = lab._create_node_local("0", "node A", "nd", "im", "cfg", 0, 0)
+    node_b = lab._create_node_local("1", "node B", "nd", "im", "cfg", 1, 1)
+    i1 = lab._create_interface_local("0", "iface A0", node_a, 0)
+    i2 = lab._create_interface_local("1", "iface B0", node_b, 0)
+    i3 = lab._create_interface_local("2", "iface B1", node_b, 1)
+    i4 = lab._create_interface_local("3", "iface A1", node_a, 1)
+    lnk1 = lab._create_link_local(i1, i2, "0")
+    lnk2 = lab._create_link_local(i4, i3, "1")
+
+    assert i1.link is lnk1 and i2.link is lnk1
+    assert lnk1._url_for("state") == "labs/1/links/0/state"
+    assert i1._url_for("state") == "labs/1/interfaces/0/state"
+    assert node_a.degree() == 2
+    assert set(node_a.links()) == {lnk1, lnk2}
+    assert set(node_a.get_links_to(node_b)) == {lnk1, lnk2}
+    assert node_a.get_link_to(node_b) is lnk1
+    node_c = lab._create_node_local("2", "node C", "nd", "im", "cfg", 2, 2)
+    assert node_a.get_links_to(node_c) == []
+    assert node_a.get_link_to(node_c) is None
+    assert node_a.peer_interfaces() == [i2, i3]
+    assert node_a.peer_nodes() == [node_b]
+
+    lab.remove_interface(i2)
+    assert i1.link is None
+    assert lnk1._stale
+    assert node_a.degree() == 1
+
+    lab.remove_link(lnk2)
+    assert i3.link is None and i4.link is None
+    assert lab._interface_links == {}
+
+
+def test_node_update_local():
+    session = MagicMock()
+    username = password = "test"
+    lab = Lab(
+        "laboratory",
+        "1",
+        session,
+        username,
+        password,
+        auto_sync=0,
+        resource_pool_manager=RESOURCE_POOL_MANAGER,
+    )
+    node = lab._create_node_local("0", "node A", "nd", "im", "cfg", 0, 0)
+    node.update(
+        {
+            "id": "0",
+            "lab_id": "1",
+            "label": "node B",
+            "x": 10,
+            "state": "BOOTED",
+            "boot_progress": "Booted",
+            "session": None,
+            "configuration": "new cfg",
+        },
+        exclude_configurations=True,
+        push_to_server=False,
+    )
+    session.patch.assert_not_called()
+    assert node.label == "node B"
+    assert node.x == 10
+    assert node._state == "BOOTED"
+    assert node._session is session
+    assert node.configuration == "cfg"
+
+
+def test_lab_batched_sync():
+    session = MagicMock()
+    username = password = "test"
+    lab = Lab(
+        "laboratory",
+        "1",
+        session,
+        username,
+        password,
+        auto_sync=1,
+        resource_pool_manager=RESOURCE_POOL_MANAGER,
+    )
+    node = lab._create_node_local("0", "node A", "nd", "im", "cfg", 0, 0)
+
+    with patch.object(lab, "_sync_topology") as sync_topology:
+        with lab.batched_sync():
+            with lab.batched_sync():
+                assert node.label == "node A"
+            assert node.interfaces() == []
+            assert lab._sync_suspension.depth == 1
+            # other threads are not affected by the block
+            thread = threading.Thread(target=lab.sync_topology_if_outdated)
+            thread.start()
+            thread.join()
+            assert sync_topology.call_count == 2
+        assert sync_topology.call_count == 2
+        assert lab._sync_suspension.depth == 0
+        lab.sync_topology_if_outdated()
+        assert sync_topology.call_count == 3
+
+
+def test_lab_wait_for_state_change():
+    session = MagicMock()
+    username = password = "test"
+    lab = Lab(
+        "laboratory",
+        "1",
+        session,
+        username,
+        password,
+        auto_sync=0,
+        resource_pool_manager=RESOURCE_POOL_MANAGER,
+    )
+    node = lab._create_node_local("0", "node A", "nd", "im", "cfg", 0, 0)
+    node._state = "STARTED"
+
+    def boot():
+        node._state = "BOOTED"
+        lab._notify_state_change()
+
+    timer = threading.Timer(0.05, boot)
+    start = time.monotonic()
+    timer.start()
+    lab._wait_for_state_change(node, 10)
+    assert time.monotonic() - start < 5
+    timer.join()
+
+
+def test_lab_start_nodes():
+    session = MagicMock()
+    username = password = "test"
+    lab = Lab(
+        "laboratory",
+        "1",
+        session,
+        username,
+        password,
+        auto_sync=0,
+        resource_pool_manager=RESOURCE_POOL_MANAGER,
+    )
+    nodes = [
+        lab._create_node_local(str(i), f"node {i}", "nd", "im", "cfg", 0, 0)
+        for i in range(3)
+    ]
+
+    with patch.object(Node, "wait_until_converged") as wait:
+        lab.start_nodes(nodes, wait=True)
+        assert [c.args[0] for c in session.put.call_args_list] == [
+            f"labs/1/nodes/{i}/state/start" for i in range(3)
+        ]
+        assert wait.call_count == 3
+
+        session.reset_mock()
+        lab.stop_nodes(nodes[:2], wait=False)
+        assert [c.args[0] for c in session.put.call_args_list] == [
+            f"labs/1/nodes/{i}/state/stop" for i in range(2)
+        ]
+        assert wait.call_count == 3
+
+
+def test_nodes_share_pooled_session():
+    session = make_session("http://dontcare")
+    username = password = "test"
+    lab = Lab(
+        "laboratory",
+        "1",
+        session,
+        username,
+        password,
+        auto_sync=0,
+        resource_pool_manager=RESOURCE_POOL_MANAGER,
+    )
+    node_a = lab._create_node_local("0", "node A", "nd", "im", "cfg", 0, 0)
+    node_b = lab._create_node_local("1", "node B", "nd", "im", "cfg", 1, 1)
+    iface = lab._create_interface_local("0", "iface A0", node_a, 0)
+    assert node_a._session is node_b._session is iface._session is session
+
+
+def test_lab_sync_if_outdated_fast_path():
+    session = MagicMock()
+    username = password = "test"
+    lab = Lab(
+        "laboratory",
+        "1",
+        session,
+        username,
+        password,
+        auto_sync=1,
+        resource_pool_manager=RESOURCE_POOL_MANAGER,
+    )
+    for kind in ("states", "l3_addresses", "operational"):
+        with patch.object(lab, f"_sync_{kind}_if_outdated") as sync:
+            getattr(lab, f"sync_{kind}_if_outdated")()
+            assert sync.call_count == 1
+        with patch.object(lab, f"sync_{kind.replace('l3', 'layer3')}") as sync:
+            getattr(lab, f"sync_{kind}_if_outdated")()
+            assert sync.call_count == 1
+
+    lab._last_sync_state_time = time.time()
+    with patch.object(lab, "_sync_states_if_outdated") as sync:
+        lab.sync_states_if_outdated()
+        sync.assert_not_called()
@@ -18,12 +18,16 @@
 # limitations under the License.
 #
 
+import asyncio
+from unittest.mock import MagicMock
+
 import pytest
 
 from virl2_client.exceptions import InvalidContentType
+from virl2_client.models.node_image_definitions import NodeImageDefinitions
 from virl2_client.virl2_client import ClientLibrary
 
-# everything except str or dict is invalid
+# everything except str, bytes or dict is invalid
 INVALID_DEFINITIONS = {
     "none": None,
     "bool": True,
@@ -34,7 +38,6 @@ INVALID_DEFINITIONS = {
     "tuple": ("test",),
     "range": range(2),
     "set": {"test"},
-    "bytes": b"test",
     "bytearray": bytearray(2),
     "object": object(),
 }
@@ -59,3 +62,150 @@ def test_upload_image_definition_invalid_body(
     """Try adding an invalid Image Definition"""
     with pytest.raises(InvalidContentType):
         client_library.definitions.upload_image_definition(invalid_definition)
+
+
+def test_definition_urls():
+    session = MagicMock()
+    definitions = NodeImageDefinitions(session)
+    definitions.set_image_definition_read_only("iosv-158-3", True)
+    session.put.assert_called_with("image_definitions/iosv-158-3/read_only", json=True)
+    definitions.set_node_definition_read_only("iosv", False)
+    session.put.assert_called_with("node_definitions/iosv/read_only", json=False)
+    assert definitions._url_for("node_defs") is definitions._url_for("node_defs")
+
+
+def test_download_many_definitions():
+    session = MagicMock()
+    session.get.side_effect = lambda url: MagicMock(**{"json.return_value": url})
+    definitions = NodeImageDefinitions(session)
+    ids = ["iosv", "alpine", "iosv", "server"]
+    assert definitions.download_node_definitions(ids) == {
+        "iosv": "node_definitions/iosv",
+        "alpine": "node_definitions/alpine",
+        "server": "node_definitions/server",
+    }
+    assert session.get.call_count == 3
+    assert definitions.download_image_definitions(["iosv-158-3"]) == {
+        "iosv-158-3": "image_definitions/iosv-158-3"
+    }
+    assert definitions.image_definitions_for_node_definitions(["iosv", "alpine"]) == {
+        "iosv": "node_definitions/iosv/image_definitions",
+        "alpine": "node_definitions/alpine/image_definitions",
+    }
+
+
+def test_remove_many_definitions():
+    session = MagicMock()
+    definitions = NodeImageDefinitions(session, cache_size=2)
+    definitions.node_definitions()
+
+    definitions.remove_image_definitions(["iosv-1", "iosv-2", "iosv-1"])
+    definitions.remove_node_definitions(["iosv"])
+    definitions.remove_dropfolder_images(["a.qcow2", "b.qcow2"])
+    assert sorted(c.args[0] for c in session.delete.call_args_list) == [
+        "image_definitions/iosv-1",
+        "image_definitions/iosv-2",
+        "images/manage/a.qcow2",
+        "images/manage/b.qcow2",
+        "node_definitions/iosv",
+    ]
+    definitions.node_definitions()
+    assert session.get.call_count == 2
+
+
+def test_download_definitions_async():
+    session = MagicMock()
+    session.get.side_effect = lambda url: MagicMock(**{"json.return_value": url})
+    definitions = NodeImageDefinitions(session)
+
+    async def download_all():
+        return await asyncio.gather(
+            definitions.node_definitions_async(),
+            definitions.image_definitions_async(),
+            definitions.image_definitions_for_node_definition_async("iosv"),
+            definitions.download_node_definition_async("iosv"),
+            definitions.download_image_definition_async("iosv-158-3"),
+        )
+
+    assert asyncio.run(download_all()) == [
+        "node_definitions/",
+        "image_definitions/",
+        "node_definitions/iosv/image_definitions",
+        "node_definitions/iosv",
+        "image_definitions/iosv-158-3",
+    ]
+
+
+def test_definition_cache():
+    session = MagicMock()
+    session.get.side_effect = lambda url: MagicMock(**{"json.return_value": [url]})
+    definitions = NodeImageDefinitions(session, cache_size=2)
+
+    result = definitions.download_node_definition("iosv")
+    result.append("modified by caller")
+    assert definitions.download_node_definition("iosv") == ["node_definitions/iosv"]
+    assert session.get.call_count == 1
+
+    definitions.download_node_definition("alpine")
+    definitions.download_node_definition("iosv")
+    # evicts the least recently used entry, "alpine"
+    definitions.download_node_definition("server")
+    assert session.get.call_count == 3
+    definitions.download_node_definition("iosv")
+    assert session.get.call_count == 3
+    definitions.download_node_definition("alpine")
+    assert session.get.call_count == 4
+
+    definitions.remove_node_definition("alpine")
+    definitions.download_node_definition("iosv")
+    assert session.get.call_count == 5
+
+    definitions.cache_size = 0
+    definitions.download_node_definition("iosv")
+    definitions.download_node_definition("iosv")
+    assert session.get.call_count == 7
+
+
+def test_definition_cache_skips_outdated_response():
+    session = MagicMock()
+    definitions = NodeImageDefinitions(session, cache_size=2)
+
+    def get(url):
+        # the definition is removed while the download is in flight
+        definitions.remove_node_definition("iosv")
+        return MagicMock(**{"json.return_value": "outdated"})
+
+    session.get.side_effect = get
+    assert definitions.download_node_definition("iosv") == "outdated"
+    session.get.side_effect = lambda url: MagicMock(**{"json.return_value": "new"})
+    assert definitions.download_node_definition("iosv") == "new"
+    assert session.get.call_count == 2
+
+
+def test_definition_cache_ttl(monkeypatch):
+    session = MagicMock()
+    session.get.side_effect = lambda url: MagicMock(**{"json.return_value": [url]})
+    definitions = NodeImageDefinitions(session, cache_size=2, cache_ttl=30)
+    now = 1000.0
+    monkeypatch.setattr(
+        "virl2_client.models.node_image_definitions.time.monotonic", lambda: now
+    )
+
+    definitions.node_definitions()
+    now += 29
+    definitions.node_definitions()
+    assert session.get.call_count == 1
+    now += 1
+    assert definitions.node_definitions() == ["node_definitions/"]
+    assert session.get.call_count == 2
+    definitions.node_definitions()
+    assert session.get.call_count == 2
+
+
+def test_upload_definition_yaml_bytes():
+    session = MagicMock()
+    definitions = NodeImageDefinitions(session)
+    definitions.upload_node_definition(b"id: test\n")
+    session.request.assert_called_with(
+        "POST", "node_definitions/", content=b"id: test\n"
+    )
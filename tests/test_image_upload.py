@@ -21,13 +21,18 @@ from __future__ import annotations
 
 import contextlib
 import pathlib
+import time
 from io import BufferedReader
 from unittest.mock import ANY, MagicMock
 
 import pytest
 
 from virl2_client.exceptions import InvalidImageFile
-from virl2_client.models.node_image_definitions import NodeImageDefinitions
+from virl2_client.models.node_image_definitions import (
+    NodeImageDefinitions,
+    _ProgressReader,
+    print_progress_bar,
+)
 
 WRONG_FORMAT_LIST = [
     "",
@@ -136,3 +141,73 @@ def test_image_upload_file(usage: str, test_string: str, message: str, test_path
         with pytest.raises(FileNotFoundError):
             with windows_path(filename):
                 nid.upload_image_file(filename, rename)
+
+
+def test_image_upload_progress_is_throttled(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        "virl2_client.models.node_image_definitions._PROGRESS_MIN_INTERVAL", 3600
+    )
+    path = tmp_path / "file.qcow2"
+    size = 3 << 20
+    path.write_bytes(b"\0" * size)
+    callback = MagicMock()
+    raw_file = open(path, "rb", buffering=0)
+    with _ProgressReader(raw_file, size, callback) as file:
+        while file.read(8192):
+            pass
+    # one report per MiB at most, plus the final one; nothing after the end
+    assert 1 <= callback.call_count <= 4
+    assert callback.call_args.args[:2] == (size, size)
+
+
+def test_print_progress_bar(capsys):
+    print_progress_bar(25, 100, time.monotonic() - 3725, length=8)
+    assert capsys.readouterr().out == "\r |##------| 25/100 25.0% [01:02:05]"
+    print_progress_bar(0, 0, time.monotonic(), length=4)
+    assert capsys.readouterr().out == "\r |####| 0/0 100.0% [00:00:00]\n"
+
+
+def test_image_upload_closes_file(tmp_path):
+    path = tmp_path / "file.qcow2"
+    path.write_bytes(b"test")
+    session = MagicMock()
+    NodeImageDefinitions(session).upload_image_file(str(path))
+    file = session.post.call_args.kwargs["files"]["field0"][1]
+    assert file.closed
+
+
+def test_image_upload_closes_file_on_error(tmp_path, monkeypatch):
+    path = tmp_path / "file.qcow2"
+    path.write_bytes(b"test")
+    opened = []
+    real_open = open
+
+    def fake_open(*args, **kwargs):
+        opened.append(real_open(*args, **kwargs))
+        return opened[-1]
+
+    def fake_fstat(fd):
+        raise OSError("fstat failed")
+
+    monkeypatch.setattr("builtins.open", fake_open)
+    monkeypatch.setattr(
+        "virl2_client.models.node_image_definitions.os.fstat", fake_fstat
+    )
+    session = MagicMock()
+    with pytest.raises(OSError, match="fstat failed"):
+        NodeImageDefinitions(session).upload_image_file(str(path))
+    assert opened[-1].closed
+    session.post.assert_not_called()
+
+
+def test_image_upload_progress_callback(tmp_path, capsys):
+    path = tmp_path / "file.qcow2"
+    path.write_bytes(b"test")
+    session = MagicMock()
+    session.post.side_effect = lambda url, files, headers: files["field0"][1].read()
+    callback = MagicMock()
+    NodeImageDefinitions(session).upload_image_file(
+        str(path), progress_callback=callback
+    )
+    callback.assert_called_once_with(4, 4, ANY)
+    assert capsys.readouterr().out == ""
@@ -341,3 +341,4 @@ class EventHandler(EventHandlerBase):
 
     def _handle_state_change(self, event: Event) -> None:
         event.element._state = event.subtype_original
+        event.lab._notify_state_change()
@@ -27,6 +27,13 @@ from uuid import uuid4
 
 import httpx
 
+try:
+    import h2  # noqa: F401
+except ImportError:
+    _HTTP2_AVAILABLE = False
+else:
+    _HTTP2_AVAILABLE = True
+
 _LOGGER = logging.getLogger(__name__)
 
 if TYPE_CHECKING:
@@ -162,6 +169,11 @@ def make_session(base_url: str, ssl_verify: bool = True) -> httpx.Client:
     Note: The base URL is automatically prepended to all HTTP calls. This means you
     should use ``_session.get("labs")`` rather than ``_session.get(base_url + "labs")``.
 
+    Connections are kept alive and reused between calls, which matters for
+    convergence polling. If the optional ``h2`` package is installed
+    (``pip install httpx[http2]``), HTTP/2 is negotiated with the controller
+    so that concurrent requests are multiplexed over a single connection.
+
     :param base_url: The base URL for the client.
     :param ssl_verify: Whether to perform SSL verification.
     :returns: The created httpx Client object.
@@ -173,4 +185,9 @@ def make_session(base_url: str, ssl_verify: bool = True) -> httpx.Client:
         follow_redirects=True,
         timeout=None,
         headers={"X-Client-UUID": str(uuid4())},
+        http2=_HTTP2_AVAILABLE,
+        # keep httpx's default cap of 100 connections
+        limits=httpx.Limits(
+            max_connections=100, max_keepalive_connections=32, keepalive_expiry=30.0
+        ),
     )
@@ -37,6 +37,22 @@ _LOGGER = logging.getLogger(__name__)
 
 
 class Interface:
+    __slots__ = (
+        "_id",
+        "_node",
+        "_type",
+        "_label",
+        "_slot",
+        "_state",
+        "_session",
+        "_lab_url",
+        "_urls",
+        "_stale",
+        "statistics",
+        "_ip_snooped_info",
+        "__weakref__",
+    )
+
     _URL_TEMPLATES = {
         "interface": "{lab}/interfaces/{id}",
         "state": "{lab}/interfaces/{id}/state",
@@ -68,6 +84,9 @@ class Interface:
         self._slot = slot
         self._state: str | None = None
         self._session: httpx.Client = node.lab._session
+        # the lab ID never changes, so its URL can be built once
+        self._lab_url = node.lab._url_for("lab")
+        self._urls: dict[str, str] = {}
         self._stale = False
         self.statistics = {
             "readbytes": 0,
@@ -90,13 +109,9 @@ class Interface:
         return f"Interface: {self._label}{' (STALE)' if self._stale else ''}"
 
     def __repr__(self):
-        return "{}({!r}, {!r}, {!r}, {!r}, {!r})".format(
-            self.__class__.__name__,
-            self._id,
-            self._node,
-            self._label,
-            self._slot,
-            self._type,
+        return (
+            f"{self.__class__.__name__}({self._id!r}, {self._node!r}, "
+            f"{self._label!r}, {self._slot!r}, {self._type!r})"
         )
 
     def __hash__(self):
@@ -110,9 +125,17 @@ class Interface:
         :param **kwargs: Keyword arguments used to format the URL.
         :returns: The formatted URL.
         """
-        kwargs["lab"] = self.node.lab._url_for("lab")
-        kwargs["id"] = self.id
-        return get_url_from_template(endpoint, self._URL_TEMPLATES, kwargs)
+        if kwargs:
+            kwargs["lab"] = self._lab_url
+            kwargs["id"] = self._id
+            return get_url_from_template(endpoint, self._URL_TEMPLATES, kwargs)
+        # URLs without extra arguments never change for an interface, build them once
+        url = self._urls.get(endpoint)
+        if url is None:
+            values = {"lab": self._lab_url, "id": self._id}
+            url = get_url_from_template(endpoint, self._URL_TEMPLATES, values)
+            self._urls[endpoint] = url
+        return url
 
     @property
     def id(self) -> str:
@@ -162,10 +185,7 @@ class Interface:
     def link(self) -> Link | None:
         """Get the link if the interface is connected, otherwise None."""
         self.node.lab.sync_topology_if_outdated()
-        for link in self.node.lab.links():
-            if self in link.interfaces:
-                return link
-        return None
+        return self.node.lab._interface_links.get(self._id)
 
     @property
     def peer_interface(self) -> Interface | None:
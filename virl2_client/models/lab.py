@@ -22,9 +22,11 @@ from __future__ import annotations
 
 import json
 import logging
+import threading
 import time
 import warnings
-from typing import TYPE_CHECKING, Any, Iterable
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Iterable, Iterator
 
 from httpx import HTTPStatusError
 
@@ -38,7 +40,7 @@ from ..exceptions import (
     NodeNotFound,
     VirlException,
 )
-from ..utils import check_stale, get_url_from_template, locked
+from ..utils import check_stale, convergence_delays, get_url_from_template, locked
 from ..utils import property_s as property
 from .annotation import (
     Annotation,
@@ -152,6 +154,17 @@ class Lab:
         Dictionary containing all interfaces in the lab.
         It maps interface identifier to `models.Interface`.
         """
+        self._node_interfaces: dict[str, dict[str, Interface]] = {}
+        """
+        Dictionary indexing the interfaces in the lab by node.
+        It maps node identifier to a dictionary of the node's interfaces,
+        which maps interface identifier to `models.Interface`.
+        """
+        self._interface_links: dict[str, Link] = {}
+        """
+        Dictionary indexing the links in the lab by interface.
+        It maps interface identifier to the `models.Link` connected to it.
+        """
         self._annotations: dict[str, Annotation] = {}
         """
         Dictionary containing all annotations in the lab.
@@ -183,6 +196,10 @@ class Lab:
         self._resource_pools = []
         self._stale = False
         self._synced_configs = True
+        self._sync_suspension = threading.local()
+        """Tracks how deeply each thread is nested in `batched_sync` blocks."""
+        self._state_changed = threading.Condition()
+        """Notified by the event handler whenever an element changes state."""
 
     def __len__(self):
         return len(self._nodes)
@@ -191,14 +208,10 @@ class Lab:
         return f"Lab: {self._title}{' (STALE)' if self._stale else ''}"
 
     def __repr__(self):
-        return "{}({!r}, {!r}, {!r}, {!r}, {!r}, {!r})".format(
-            self.__class__.__name__,
-            self._title,
-            self._id,
-            self._session.base_url.path,
-            self.auto_sync,
-            self.auto_sync_interval,
-            self.wait_for_convergence,
+        return (
+            f"{self.__class__.__name__}({self._title!r}, {self._id!r}, "
+            f"{self._session.base_url.path!r}, {self.auto_sync!r}, "
+            f"{self.auto_sync_interval!r}, {self.wait_for_convergence!r})"
         )
 
     def _url_for(self, endpoint, **kwargs):
@@ -229,62 +242,130 @@ class Lab:
             raise ValueError
         return local_wait
 
-    @check_stale
-    @locked
+    def _sync_due(self, last_sync_time: float) -> bool:
+        """
+        Check whether data last synced at the given time should be synced again.
+
+        :param last_sync_time: The time of the last sync.
+        :returns: True if auto-sync is enabled and the interval has passed.
+        """
+        return self.auto_sync and time.time() - last_sync_time > self.auto_sync_interval
+
     def sync_statistics_if_outdated(self) -> None:
         """Sync statistics if they are outdated."""
-        timestamp = time.time()
-        if (
-            self.auto_sync
-            and timestamp - self._last_sync_statistics_time > self.auto_sync_interval
-        ):
-            self.sync_statistics()
+        # Called by every statistics getter, so skip the staleness check
+        # and lock acquisition when the statistics are still current.
+        if self._stale or self._sync_due(self._last_sync_statistics_time):
+            self._sync_statistics_if_outdated()
 
     @check_stale
     @locked
+    def _sync_statistics_if_outdated(self) -> None:
+        """Helper function to sync statistics if they are outdated."""
+        if self._sync_due(self._last_sync_statistics_time):
+            self.sync_statistics()
+
     def sync_states_if_outdated(self) -> None:
         """Sync states if they are outdated."""
-        timestamp = time.time()
-        if (
-            self.auto_sync
-            and timestamp - self._last_sync_state_time > self.auto_sync_interval
-        ):
-            self.sync_states()
+        if self._stale or self._sync_due(self._last_sync_state_time):
+            self._sync_states_if_outdated()
 
     @check_stale
     @locked
+    def _sync_states_if_outdated(self) -> None:
+        """Helper function to sync states if they are outdated."""
+        if self._sync_due(self._last_sync_state_time):
+            self.sync_states()
+
     def sync_l3_addresses_if_outdated(self) -> None:
         """Sync L3 addresses if they are outdated."""
-        timestamp = time.time()
-        if (
-            self.auto_sync
-            and timestamp - self._last_sync_l3_address_time > self.auto_sync_interval
-        ):
-            self.sync_layer3_addresses()
+        if self._stale or self._sync_due(self._last_sync_l3_address_time):
+            self._sync_l3_addresses_if_outdated()
 
     @check_stale
     @locked
+    def _sync_l3_addresses_if_outdated(self) -> None:
+        """Helper function to sync L3 addresses if they are outdated."""
+        if self._sync_due(self._last_sync_l3_address_time):
+            self.sync_layer3_addresses()
+
     def sync_topology_if_outdated(self, exclude_configurations=True) -> None:
         """Sync the topology if it is outdated."""
-        timestamp = time.time()
+        # Called by nearly every getter, so skip the staleness check
+        # and lock acquisition when the local topology is still current.
+        if (
+            self._stale
+            or not (exclude_configurations or self._synced_configs)
+            or (
+                not getattr(self._sync_suspension, "depth", 0)
+                and self._sync_due(self._last_sync_topology_time)
+            )
+        ):
+            self._sync_topology_if_outdated(exclude_configurations)
+
+    def _wait_for_state_change(
+        self, element: Node | Interface | Link, timeout: float
+    ) -> None:
+        """
+        Wait until the state of an element changes, at most `timeout` seconds.
+
+        States only change in the background when websocket events are being
+        received; otherwise this simply sleeps for `timeout` seconds.
+
+        :param element: The node, interface or link to watch.
+        :param timeout: The maximum time to wait.
+        """
+        state = element._state
+        with self._state_changed:
+            self._state_changed.wait_for(lambda: element._state != state, timeout)
+
+    def _notify_state_change(self) -> None:
+        """Wake up threads waiting for a state change in this lab."""
+        with self._state_changed:
+            self._state_changed.notify_all()
+
+    @contextmanager
+    def batched_sync(self) -> Iterator[None]:
+        """
+        Sync the topology once if it is outdated, then use the local topology
+        for the rest of the block. Example::
+
+            with lab.batched_sync():
+                for node in lab.nodes():
+                    print(node.label, node.x, node.y, node.ram)
+
+        The topology is not refreshed automatically in the calling thread while
+        the block is active, so changes made on the server during the block are
+        picked up after it. Other threads keep syncing as usual.
+        """
+        self.sync_topology_if_outdated()
+        suspension = self._sync_suspension
+        suspension.depth = getattr(suspension, "depth", 0) + 1
+        try:
+            yield
+        finally:
+            suspension.depth -= 1
+
+    @check_stale
+    @locked
+    def _sync_topology_if_outdated(self, exclude_configurations=True) -> None:
+        """Helper function to sync the topology if it is outdated."""
         if not (exclude_configurations or self._synced_configs):
             self._sync_topology(exclude_configurations=False)
-        elif (
-            self.auto_sync
-            and timestamp - self._last_sync_topology_time > self.auto_sync_interval
-        ):
+        elif self._sync_due(self._last_sync_topology_time):
             self._sync_topology(exclude_configurations=exclude_configurations)
             self._synced_configs = not exclude_configurations
 
-    @check_stale
-    @locked
     def sync_operational_if_outdated(self) -> None:
         """Sync the operational data if it is outdated."""
-        timestamp = time.time()
-        if (
-            self.auto_sync
-            and timestamp - self._last_sync_operational_time > self.auto_sync_interval
-        ):
+        if self._stale or self._sync_due(self._last_sync_operational_time):
+            self._sync_operational_if_outdated()
+
+    @check_stale
+    @locked
+    def _sync_operational_if_outdated(self) -> None:
+        """Helper function to sync the operational data if it is outdated."""
+        if self._sync_due(self._last_sync_operational_time):
             self.sync_operational()
 
     @property
@@ -678,9 +759,9 @@ class Lab:
     @locked
     def _remove_node_local(self, node: Node) -> None:
         """Helper function to remove a node from the client library."""
-        for iface in tuple(self._interfaces.values()):
-            if iface._node is node:
-                self._remove_interface_local(iface)
+        for iface in tuple(self._node_interfaces.get(node._id, {}).values()):
+            self._remove_interface_local(iface)
+        self._node_interfaces.pop(node._id, None)
         try:
             del self._nodes[node._id]
             node._stale = True
@@ -732,6 +813,7 @@ class Lab:
     @locked
     def _remove_link_local(self, link: Link) -> None:
         """Helper function to remove a link from the client library."""
+        self._unindex_link(link)
         try:
             del self._links[link._id]
             link._stale = True
@@ -769,10 +851,9 @@ class Lab:
     @locked
     def _remove_interface_local(self, iface: Interface) -> None:
         """Helper function to remove an interface from the client library."""
-        for link in tuple(self._links.values()):
-            if iface in link.interfaces:
-                self._remove_link_local(link)
-                break
+        if (link := self._interface_links.get(iface._id)) is not None:
+            self._remove_link_local(link)
+        self._node_interfaces.get(iface._node._id, {}).pop(iface._id, None)
         try:
             del self._interfaces[iface._id]
             iface._stale = True
@@ -863,8 +944,16 @@ class Lab:
         """Helper function to create a link in the client library."""
         link = Link(self, link_id, i1, i2, label)
         self._links[link_id] = link
+        self._interface_links[i1._id] = link
+        self._interface_links[i2._id] = link
         return link
 
+    def _unindex_link(self, link: Link) -> None:
+        """Helper function to remove a link from the interface index."""
+        for iface in (link._interface_a, link._interface_b):
+            if self._interface_links.get(iface._id) is link:
+                del self._interface_links[iface._id]
+
     @check_stale
     @locked
     def connect_two_nodes(self, node1: Node, node2: Node) -> Link:
@@ -942,10 +1031,12 @@ class Lab:
             self._interfaces[iface_id] = iface
         else:  # update the interface if it already exists:
             iface = self._interfaces[iface_id]
+            self._node_interfaces.get(iface._node._id, {}).pop(iface_id, None)
             iface._node = node
             iface._label = label
             iface._slot = slot
             iface._type = iface_type
+        self._node_interfaces.setdefault(node._id, {})[iface_id] = iface
         return iface
 
     @check_stale
@@ -1083,14 +1174,17 @@ class Lab:
         Wait until the lab converges.
 
         :param max_iterations: The maximum number of iterations to wait.
-        :param wait_time: The time to wait between iterations.
+        :param wait_time: The maximum time to wait between iterations. Polling
+            starts with a shorter interval that doubles up to this value.
         """
         max_iter = (
             self.wait_max_iterations if max_iterations is None else max_iterations
         )
         wait_time = self.wait_time if wait_time is None else wait_time
         _LOGGER.info(f"Waiting for lab {self._id} to converge.")
-        for index in range(max_iter):
+        attempts = 0
+        for index, delay in convergence_delays(max_iter, wait_time):
+            attempts += 1
             converged = self.has_converged()
             if converged:
                 _LOGGER.info(f"Lab {self._id} has booted.")
@@ -1098,11 +1192,14 @@ class Lab:
 
             if index % 10 == 0:
                 _LOGGER.info(
-                    f"Lab has not converged, attempt {index}/{max_iter}, waiting..."
+                    f"Lab has not converged after {attempts} checks, waiting..."
                 )
-            time.sleep(wait_time)
+            time.sleep(delay)
 
-        msg = f"Lab {self.id} has not converged, maximum tries {max_iter} exceeded."
+        msg = (
+            f"Lab {self.id} has not converged, maximum tries {max_iter} "
+            f"exceeded ({attempts} checks in {max_iter * wait_time:g} seconds)."
+        )
         _LOGGER.error(msg)
         # After maximum retries are exceeded and lab has not converged,
         # an error must be raised - it makes no sense to just log info
@@ -1149,6 +1246,50 @@ class Lab:
             self.wait_until_lab_converged()
         _LOGGER.debug(f"Stopped lab: {self._id}")
 
+    @check_stale
+    def start_nodes(self, nodes: Iterable[Node], wait: bool | None = None) -> None:
+        """
+        Start the given nodes.
+
+        All nodes are started before waiting for any of them, so they boot
+        in parallel and the wait lasts about as long as the slowest node.
+
+        :param nodes: The nodes to start.
+        :param wait: A flag indicating whether to wait for convergence.
+            If left at the default value, the lab's wait property is used instead.
+        """
+        self._nodes_action(nodes, "start", wait)
+
+    @check_stale
+    def stop_nodes(self, nodes: Iterable[Node], wait: bool | None = None) -> None:
+        """
+        Stop the given nodes.
+
+        All nodes are stopped before waiting for any of them to converge.
+
+        :param nodes: The nodes to stop.
+        :param wait: A flag indicating whether to wait for convergence.
+            If left at the default value, the lab's wait property is used instead.
+        """
+        self._nodes_action(nodes, "stop", wait)
+
+    def _nodes_action(
+        self, nodes: Iterable[Node], action: str, wait: bool | None
+    ) -> None:
+        """
+        Helper function to run a state action on several nodes, then wait.
+
+        :param nodes: The nodes to act on.
+        :param action: The name of the node method to call.
+        :param wait: A flag indicating whether to wait for convergence.
+        """
+        nodes = list(nodes)
+        for node in nodes:
+            getattr(node, action)(wait=False)
+        if self.need_to_wait(wait):
+            for node in nodes:
+                node.wait_until_converged()
+
     @check_stale
     def state(self) -> str:
         """
@@ -1597,16 +1738,19 @@ class Lab:
         """
         for link_id in removed_links:
             link = self._links.pop(link_id)
+            self._unindex_link(link)
             _LOGGER.info(f"Removed link {link}")
             link._stale = True
 
         for interface_id in removed_interfaces:
             interface = self._interfaces.pop(interface_id)
+            self._node_interfaces.get(interface._node._id, {}).pop(interface_id, None)
             _LOGGER.info(f"Removed interface {interface}")
             interface._stale = True
 
         for node_id in removed_nodes:
             node = self._nodes.pop(node_id)
+            self._node_interfaces.pop(node_id, None)
             _LOGGER.info(f"Removed node {node}")
             node._stale = True
 
@@ -25,7 +25,7 @@ import time
 import warnings
 from typing import TYPE_CHECKING
 
-from ..utils import check_stale, get_url_from_template, locked
+from ..utils import check_stale, convergence_delays, get_url_from_template, locked
 from ..utils import property_s as property
 
 if TYPE_CHECKING:
@@ -39,6 +39,21 @@ _LOGGER = logging.getLogger(__name__)
 
 
 class Link:
+    __slots__ = (
+        "_id",
+        "_interface_a",
+        "_interface_b",
+        "_label",
+        "lab",
+        "_session",
+        "_lab_url",
+        "_urls",
+        "_state",
+        "_stale",
+        "statistics",
+        "__weakref__",
+    )
+
     _URL_TEMPLATES = {
         "link": "{lab}/links/{id}",
         "check_if_converged": "{lab}/links/{id}/check_if_converged",
@@ -72,6 +87,9 @@ class Link:
         self._label = label
         self.lab = lab
         self._session: httpx.Client = lab._session
+        # the lab ID never changes, so its URL can be built once
+        self._lab_url = lab._url_for("lab")
+        self._urls: dict[str, str] = {}
         self._state: str | None = None
         # When the link is removed on the server, this link object is marked stale
         # and can no longer be interacted with - the user should discard it
@@ -87,13 +105,9 @@ class Link:
         return f"Link: {self._label}{' (STALE)' if self._stale else ''}"
 
     def __repr__(self):
-        return "{}({!r}, {!r}, {!r}, {!r}, {!r})".format(
-            self.__class__.__name__,
-            str(self.lab),
-            self._id,
-            self._interface_a,
-            self._interface_b,
-            self._label,
+        return (
+            f"{self.__class__.__name__}({str(self.lab)!r}, {self._id!r}, "
+            f"{self._interface_a!r}, {self._interface_b!r}, {self._label!r})"
         )
 
     def __eq__(self, other: object):
@@ -112,9 +126,17 @@ class Link:
         :param **kwargs: Keyword arguments used to format the URL.
         :returns: The formatted URL.
         """
-        kwargs["lab"] = self.lab._url_for("lab")
-        kwargs["id"] = self.id
-        return get_url_from_template(endpoint, self._URL_TEMPLATES, kwargs)
+        if kwargs:
+            kwargs["lab"] = self._lab_url
+            kwargs["id"] = self._id
+            return get_url_from_template(endpoint, self._URL_TEMPLATES, kwargs)
+        # URLs without extra arguments never change for a link, build them once
+        url = self._urls.get(endpoint)
+        if url is None:
+            values = {"lab": self._lab_url, "id": self._id}
+            url = get_url_from_template(endpoint, self._URL_TEMPLATES, values)
+            self._urls[endpoint] = url
+        return url
 
     @property
     def id(self) -> str:
@@ -235,7 +257,8 @@ class Link:
         Wait until the link has converged.
 
         :param max_iterations: The maximum number of iterations to wait for convergence.
-        :param wait_time: The time to wait between iterations.
+        :param wait_time: The maximum time to wait between iterations. Polling
+            starts with a shorter interval that doubles up to this value.
         :raises RuntimeError: If the link does not converge within the specified number
             of iterations.
         """
@@ -244,7 +267,9 @@ class Link:
             self.lab.wait_max_iterations if max_iterations is None else max_iterations
         )
         wait_time = self.lab.wait_time if wait_time is None else wait_time
-        for index in range(max_iter):
+        attempts = 0
+        for index, delay in convergence_delays(max_iter, wait_time):
+            attempts += 1
             converged = self.has_converged()
             if converged:
                 _LOGGER.info(f"Link {self.id} has converged")
@@ -252,11 +277,14 @@ class Link:
 
             if index % 10 == 0:
                 _LOGGER.info(
-                    f"Link has not converged, attempt {index}/{max_iter}, waiting..."
+                    f"Link has not converged after {attempts} checks, waiting..."
                 )
-            time.sleep(wait_time)
+            time.sleep(delay)
 
-        msg = f"Link {self.id} has not converged, maximum tries {max_iter} exceeded"
+        msg = (
+            f"Link {self.id} has not converged, maximum tries {max_iter} "
+            f"exceeded ({attempts} checks in {max_iter * wait_time:g} seconds)."
+        )
         _LOGGER.error(msg)
         # after maximum retries are exceeded and link has not converged
         # error must be raised - it makes no sense to just log info
@@ -21,15 +21,19 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import threading
 import time
 import warnings
+from contextlib import contextmanager
 from copy import deepcopy
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, Iterable, Iterator
 
 from ..exceptions import InterfaceNotFound
-from ..utils import check_stale, get_url_from_template, locked
+from ..utils import check_stale, convergence_delays, get_url_from_template, locked
 from ..utils import property_s as property
+from ..utils import run_in_executor
 
 if TYPE_CHECKING:
     import httpx
@@ -40,8 +44,64 @@ if TYPE_CHECKING:
 
 _LOGGER = logging.getLogger(__name__)
 
+_ACTIVE_STATES = frozenset(("STARTED", "QUEUED", "BOOTED"))
+# node data fields that update() stores as-is, mapped to their attribute
+_UPDATE_FIELDS = {
+    key: f"_{key}"
+    for key in (
+        "label",
+        "node_definition",
+        "image_definition",
+        "x",
+        "y",
+        "state",
+        "ram",
+        "cpus",
+        "cpu_limit",
+        "data_volume",
+        "boot_disk_size",
+        "hide_links",
+        "tags",
+        "compute_id",
+        "resource_pool",
+        "pinned_compute_id",
+        "parameters",
+    )
+}
+
 
 class Node:
+    __slots__ = (
+        "lab",
+        "_id",
+        "_lab_url",
+        "_urls",
+        "_label",
+        "_node_definition",
+        "_x",
+        "_y",
+        "_state",
+        "_session",
+        "_image_definition",
+        "_ram",
+        "_configuration",
+        "_cpus",
+        "_cpu_limit",
+        "_data_volume",
+        "_boot_disk_size",
+        "_hide_links",
+        "_tags",
+        "_compute_id",
+        "_resource_pool",
+        "_pinned_compute_id",
+        "_stale",
+        "_last_sync_l3_address_time",
+        "_parameters",
+        "_pending",
+        "statistics",
+        "__weakref__",
+    )
+
     _URL_TEMPLATES = {
         "node": "{lab}/nodes/{id}?{CONFIG_MODE}",
         "state": "{lab}/nodes/{id}/state",
@@ -107,6 +167,9 @@ class Node:
         """
         self.lab = lab
         self._id = nid
+        # the lab ID never changes, so its URL can be built once
+        self._lab_url = lab._url_for("lab")
+        self._urls: dict[str, str] = {}
         self._label = label
         self._node_definition = node_definition
         self._x = x
@@ -131,6 +194,8 @@ class Node:
         self._stale = False
         self._last_sync_l3_address_time = 0.0
         self._parameters = parameters
+        # deferred changes of `batched_updates` blocks, kept separate per thread
+        self._pending = threading.local()
 
         self.statistics: dict[str, int | float] = {
             "cpu_usage": 0,
@@ -143,25 +208,12 @@ class Node:
 
     def __repr__(self):
         return (
-            "{}({!r}, {!r}, {!r}, {!r}, {!r}, {!r}, {!r}, "
-            "{!r}, {!r}, {!r}, {!r}, {!r}, {!r}, {!r}, {!r})".format(
-                self.__class__.__name__,
-                str(self.lab),
-                self._id,
-                self._label,
-                self._node_definition,
-                self._image_definition,
-                self._configuration,
-                self._x,
-                self._y,
-                self._ram,
-                self._cpus,
-                self._cpu_limit,
-                self._data_volume,
-                self._boot_disk_size,
-                self._hide_links,
-                self._tags,
-            )
+            f"{self.__class__.__name__}({str(self.lab)!r}, {self._id!r}, "
+            f"{self._label!r}, {self._node_definition!r}, "
+            f"{self._image_definition!r}, {self._configuration!r}, {self._x!r}, "
+            f"{self._y!r}, {self._ram!r}, {self._cpus!r}, {self._cpu_limit!r}, "
+            f"{self._data_volume!r}, {self._boot_disk_size!r}, "
+            f"{self._hide_links!r}, {self._tags!r})"
         )
 
     def __eq__(self, other):
@@ -180,19 +232,29 @@ class Node:
         :param **kwargs: Keyword arguments used to format the URL.
         :returns: The formatted URL.
         """
-        kwargs["lab"] = self.lab._url_for("lab")
-        kwargs["id"] = self.id
-        return get_url_from_template(endpoint, self._URL_TEMPLATES, kwargs)
+        if kwargs:
+            kwargs["lab"] = self._lab_url
+            kwargs["id"] = self._id
+            return get_url_from_template(endpoint, self._URL_TEMPLATES, kwargs)
+        # URLs without extra arguments never change for a node, build them once
+        url = self._urls.get(endpoint)
+        if url is None:
+            values = {"lab": self._lab_url, "id": self._id}
+            url = get_url_from_template(endpoint, self._URL_TEMPLATES, values)
+            self._urls[endpoint] = url
+        return url
+
+    def sync_l3_addresses_if_outdated(self) -> None:
+        # Called by every address getter of the node's interfaces, so skip
+        # the staleness check and lock acquisition while the data is current.
+        if self._stale or self.lab._sync_due(self._last_sync_l3_address_time):
+            self._sync_l3_addresses_if_outdated()
 
     @check_stale
     @locked
-    def sync_l3_addresses_if_outdated(self) -> None:
-        timestamp = time.time()
-        if (
-            self.lab.auto_sync
-            and timestamp - self._last_sync_l3_address_time
-            > self.lab.auto_sync_interval
-        ):
+    def _sync_l3_addresses_if_outdated(self) -> None:
+        """Helper function to sync L3 addresses if they are outdated."""
+        if self.lab._sync_due(self._last_sync_l3_address_time):
             self.sync_layer3_addresses()
 
     @property
@@ -210,13 +272,28 @@ class Node:
     def interfaces(self) -> list[Interface]:
         """Return a list of interfaces on the node."""
         self.lab.sync_topology_if_outdated()
-        return [iface for iface in self.lab.interfaces() if iface.node is self]
+        return list(self._interfaces_nosync())
+
+    @check_stale
+    @locked
+    def iter_interfaces(self) -> Iterator[Interface]:
+        """
+        Return an iterator over the interfaces on the node.
+
+        Unlike :meth:`interfaces`, no list is built. The topology must not change
+        while the iterator is being consumed.
+        """
+        self.lab.sync_topology_if_outdated()
+        return iter(self._interfaces_nosync())
+
+    def _interfaces_nosync(self) -> Iterable[Interface]:
+        """Helper function to return the node's interfaces without syncing."""
+        return self.lab._node_interfaces.get(self._id, {}).values()
 
     @locked
     def physical_interfaces(self) -> list[Interface]:
         """Return a list of physical interfaces on the node."""
-        self.lab.sync_topology_if_outdated()
-        return [iface for iface in self.interfaces() if iface.physical]
+        return [iface for iface in self.iter_interfaces() if iface.physical]
 
     @check_stale
     @locked
@@ -245,38 +322,60 @@ class Node:
         :returns: An available physical interface or None if all existing
             ones are connected.
         """
-        for iface in self.interfaces():
-            if not iface.connected and iface.physical:
+        self.lab.sync_topology_if_outdated()
+        iface_links = self.lab._interface_links
+        for iface in self._interfaces_nosync():
+            if iface.physical and iface._id not in iface_links:
                 return iface
         return None
 
     @locked
     def peer_interfaces(self) -> list[Interface]:
         """Return a list of interfaces connected to this node."""
-        peer_ifaces = []
-        for iface in self.interfaces():
-            peer_iface = iface.peer_interface
-            if peer_iface is not None and peer_iface not in peer_ifaces:
-                peer_ifaces.append(peer_iface)
-        return peer_ifaces
+        self.lab.sync_topology_if_outdated()
+        return self._peer_interfaces_nosync()
+
+    def _peer_interfaces_nosync(self) -> list[Interface]:
+        """Helper function to collect peer interfaces without syncing."""
+        # a dict keeps the interface order while dropping duplicates in O(1)
+        peer_ifaces: dict[Interface, None] = {}
+        iface_links = self.lab._interface_links
+        for iface in self._interfaces_nosync():
+            link = iface_links.get(iface._id)
+            if link is None:
+                continue
+            peer_iface = (
+                link._interface_b if link._interface_a is iface else link._interface_a
+            )
+            peer_ifaces[peer_iface] = None
+        return list(peer_ifaces)
 
     @locked
     def peer_nodes(self) -> list[Node]:
         """Return a list of nodes connected to this node."""
-        return list({iface.node for iface in self.peer_interfaces()})
+        self.lab.sync_topology_if_outdated()
+        return list({iface._node for iface in self._peer_interfaces_nosync()})
 
     @locked
     def links(self) -> list[Link]:
         """Return a list of links connected to this node."""
-        return list(
-            {link for iface in self.interfaces() if (link := iface.link) is not None}
-        )
+        self.lab.sync_topology_if_outdated()
+        return list(self._link_set())
 
     @locked
     def degree(self) -> int:
         """Return the degree of the node."""
         self.lab.sync_topology_if_outdated()
-        return len(self.links())
+        return len(self._link_set())
+
+    def _link_set(self) -> set[Link]:
+        """Helper function to collect the links connected to this node."""
+        iface_links = self.lab._interface_links
+        return {
+            link
+            for iface in self._interfaces_nosync()
+            if (link := iface_links.get(iface._id)) is not None
+        }
 
     @property
     def id(self) -> str:
@@ -575,7 +674,7 @@ class Node:
         :returns: The interface with the specified label.
         :raises InterfaceNotFound: If no interface with the specified label is found.
         """
-        for iface in self.interfaces():
+        for iface in self.iter_interfaces():
             if iface.label == label:
                 return iface
         raise InterfaceNotFound(f"{label}:{self}")
@@ -589,11 +688,12 @@ class Node:
         :returns: The interface with the specified slot.
         :raises InterfaceNotFound: If no interface with the specified slot is found.
         """
-        for iface in self.interfaces():
+        for iface in self.iter_interfaces():
             if iface.slot == slot:
                 return iface
         raise InterfaceNotFound(f"{slot}:{self}")
 
+    @locked
     def get_links_to(self, other_node: Node) -> list[Link]:
         """
         Return all links between this node and another.
@@ -601,12 +701,11 @@ class Node:
         :param other_node: The other node.
         :returns: A list of links between this node and the other node.
         """
-        links = []
-        for link in self.links():
-            if other_node in link.nodes:
-                links.append(link)
-        return links
+        self.lab.sync_topology_if_outdated()
+        # a dict drops the second hit of a link with both ends on this node
+        return list(dict.fromkeys(self._iter_links_to(other_node)))
 
+    @locked
     def get_link_to(self, other_node: Node) -> Link | None:
         """
         Return one link between this node and another.
@@ -614,10 +713,19 @@ class Node:
         :param other_node: The other node.
         :returns: A link between this node and the other node, if one exists.
         """
-        for link in self.links():
-            if other_node in link.nodes:
-                return link
-        return None
+        self.lab.sync_topology_if_outdated()
+        return next(self._iter_links_to(other_node), None)
+
+    def _iter_links_to(self, other_node: Node) -> Iterator[Link]:
+        """Helper function to yield the links to another node without syncing."""
+        iface_links = self.lab._interface_links
+        for iface in self._interfaces_nosync():
+            link = iface_links.get(iface._id)
+            if link is not None and (
+                link._interface_a._node == other_node
+                or link._interface_b._node == other_node
+            ):
+                yield link
 
     @check_stale
     def wait_until_converged(
@@ -627,7 +735,10 @@ class Node:
         Wait until the node has converged.
 
         :param max_iterations: The maximum number of iterations to wait for convergence.
-        :param wait_time: The time to wait between iterations.
+        :param wait_time: The maximum time to wait between iterations. Polling
+            starts with a shorter interval that doubles up to this value.
+            When websocket events are being received, a state change of the
+            node triggers the next check right away.
         :raises RuntimeError: If the node does not converge within the specified number
             of iterations.
         """
@@ -636,7 +747,9 @@ class Node:
             self.lab.wait_max_iterations if max_iterations is None else max_iterations
         )
         wait_time = self.lab.wait_time if wait_time is None else wait_time
-        for index in range(max_iter):
+        attempts = 0
+        for index, delay in convergence_delays(max_iter, wait_time):
+            attempts += 1
             converged = self.has_converged()
             if converged:
                 _LOGGER.info(f"Node {self.id} has converged.")
@@ -644,11 +757,15 @@ class Node:
 
             if index % 10 == 0:
                 _LOGGER.info(
-                    f"Node has not converged, attempt {index}/{max_iter}, waiting..."
+                    f"Node has not converged after {attempts} checks, waiting..."
                 )
-            time.sleep(wait_time)
+            # with event listening, a state change ends the wait early
+            self.lab._wait_for_state_change(self, delay)
 
-        msg = f"Node {self.id} has not converged, maximum tries {max_iter} exceeded."
+        msg = (
+            f"Node {self.id} has not converged, maximum tries {max_iter} "
+            f"exceeded ({attempts} checks in {max_iter * wait_time:g} seconds)."
+        )
         _LOGGER.error(msg)
         # after maximum retries are exceeded and node has not converged
         # error must be raised - it makes no sense to just log info
@@ -702,6 +819,83 @@ class Node:
         if self.lab.need_to_wait(wait):
             self.wait_until_converged()
 
+    async def wait_until_converged_async(
+        self, max_iterations: int | None = None, wait_time: int | None = None
+    ) -> None:
+        """
+        Wait until the node has converged without blocking the event loop.
+
+        :param max_iterations: The maximum number of iterations to wait for convergence.
+        :param wait_time: The maximum time to wait between iterations.
+        :raises RuntimeError: If the node does not converge within the specified number
+            of iterations.
+        """
+        _LOGGER.info(f"Waiting for node {self.id} to converge.")
+        max_iter = (
+            self.lab.wait_max_iterations if max_iterations is None else max_iterations
+        )
+        wait_time = self.lab.wait_time if wait_time is None else wait_time
+        attempts = 0
+        for index, delay in convergence_delays(max_iter, wait_time):
+            attempts += 1
+            if await self.has_converged_async():
+                _LOGGER.info(f"Node {self.id} has converged.")
+                return
+
+            if index % 10 == 0:
+                _LOGGER.info(
+                    f"Node has not converged after {attempts} checks, waiting..."
+                )
+            await asyncio.sleep(delay)
+
+        msg = (
+            f"Node {self.id} has not converged, maximum tries {max_iter} "
+            f"exceeded ({attempts} checks in {max_iter * wait_time:g} seconds)."
+        )
+        _LOGGER.error(msg)
+        raise RuntimeError(msg)
+
+    async def has_converged_async(self) -> bool:
+        """
+        Check if the node has converged without blocking the event loop.
+
+        :returns: True if the node has converged, False otherwise.
+        """
+        return await run_in_executor(self.has_converged)
+
+    async def start_async(self, wait=False) -> None:
+        """
+        Start the node without blocking the event loop, so that many nodes
+        can be started concurrently::
+
+            await asyncio.gather(*(node.start_async() for node in nodes))
+
+        :param wait: Whether to wait until the node has converged.
+        """
+        await run_in_executor(self.start, wait=False)
+        if self.lab.need_to_wait(wait):
+            await self.wait_until_converged_async()
+
+    async def stop_async(self, wait=False) -> None:
+        """
+        Stop the node without blocking the event loop.
+
+        :param wait: Whether to wait until the node has converged.
+        """
+        await run_in_executor(self.stop, wait=False)
+        if self.lab.need_to_wait(wait):
+            await self.wait_until_converged_async()
+
+    async def wipe_async(self, wait=False) -> None:
+        """
+        Wipe the node's disks without blocking the event loop.
+
+        :param wait: Whether to wait until the node has converged.
+        """
+        await run_in_executor(self.wipe, wait=False)
+        if self.lab.need_to_wait(wait):
+            await self.wait_until_converged_async()
+
     @check_stale
     def extract_configuration(self) -> None:
         """Update the configuration from the running node."""
@@ -787,8 +981,9 @@ class Node:
         """
         current = self.tags()
         if tag not in current:
-            current.append(tag)
-            self._set_node_property("tags", current)
+            tags = current + [tag]
+            self._set_node_property("tags", tags)
+            self._tags = tags
 
     @locked
     def remove_tag(self, tag: str) -> None:
@@ -797,9 +992,10 @@ class Node:
 
         :param tag: The tag to remove.
         """
-        current = self.tags()
-        current.remove(tag)
-        self._set_node_property("tags", current)
+        tags = list(self.tags())
+        tags.remove(tag)
+        self._set_node_property("tags", tags)
+        self._tags = tags
 
     def run_pyats_command(self, command: str) -> str:
         """
@@ -861,12 +1057,9 @@ class Node:
 
         :param mapping: A dictionary mapping MAC addresses to interface information.
         """
+        ifaces_by_label = {iface._label: iface for iface in self.iter_interfaces()}
         for mac_address, entry in mapping.items():
-            if not (label := entry.get("label")):
-                continue
-            try:
-                iface = self.get_interface_by_label(label)
-            except InterfaceNotFound:
+            if (iface := ifaces_by_label.get(entry.get("label"))) is None:
                 continue
             ipv4 = entry.get("ip4")
             ipv6 = entry.get("ip6")
@@ -899,14 +1092,14 @@ class Node:
             node_data = node_data["data"]
 
         for key, value in node_data.items():
-            if key == "configuration":
+            if (attr := _UPDATE_FIELDS.get(key)) is not None:
+                setattr(self, attr, value)
+            elif key == "configuration":
                 if not exclude_configurations:
                     self._set_configuration(value)
-                continue
-            if key == "operational":
+            elif key == "operational":
                 self.sync_operational(node_data)
-                continue
-            setattr(self, f"_{key}", value)
+            # any other field is not tracked by the client
 
     def is_active(self) -> bool:
         """
@@ -914,8 +1107,7 @@ class Node:
 
         :returns: True if the node is in an active state, False otherwise.
         """
-        active_states = {"STARTED", "QUEUED", "BOOTED"}
-        return self.state in active_states
+        return self.state in _ACTIVE_STATES
 
     def is_booted(self) -> bool:
         """
@@ -932,9 +1124,48 @@ class Node:
         :param key: The key of the property to set.
         :param val: The value to set.
         """
-        _LOGGER.debug(f"Setting node property {self} {key}: {val}")
+        # lazy formatting, the value may be a whole configuration
+        _LOGGER.debug("Setting node property %s %s: %s", self, key, val)
         self._set_node_properties({key: val})
 
+    @contextmanager
+    def batched_updates(self) -> Iterator[None]:
+        """
+        Defer property changes made within the block and send them to the server
+        in a single request when the block exits. Example::
+
+            with node.batched_updates():
+                node.label = "router-1"
+                node.x = 100
+                node.y = 200
+
+        Local values are updated immediately. If the same property is set
+        more than once, only the last value is sent. If the block raises,
+        nothing is sent and the local values are restored to what they were
+        before the block.
+
+        Only changes made by the calling thread are deferred, changes made by
+        other threads during the block are sent right away.
+        """
+        pending = self._pending
+        if getattr(pending, "properties", None) is not None:
+            # nested block, the outermost one sends the update
+            yield
+            return
+        pending.properties = {}
+        pending.previous = {}
+        try:
+            yield
+        except BaseException:
+            for attr, value in pending.previous.items():
+                setattr(self, attr, value)
+            raise
+        finally:
+            properties, pending.properties = pending.properties, None
+            pending.previous = {}
+        if properties:
+            self._set_node_properties(properties)
+
     @check_stale
     def _set_node_properties(self, node_data: dict[str, Any]) -> None:
         """
@@ -942,5 +1173,17 @@ class Node:
 
         :param node_data: A dictionary containing the properties to set.
         """
+        pending = self._pending
+        if getattr(pending, "properties", None) is not None:
+            # remember the local values from before the block, to restore on error
+            for key in node_data.get("data", node_data):
+                if key == "configuration":
+                    attr = "_configuration"
+                else:
+                    attr = _UPDATE_FIELDS.get(key)
+                if attr is not None and attr not in pending.previous:
+                    pending.previous[attr] = deepcopy(getattr(self, attr))
+            pending.properties.update(node_data)
+            return
         url = self._url_for("node")
         self._session.patch(url, json=node_data)
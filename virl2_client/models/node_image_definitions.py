@@ -20,18 +20,28 @@
 
 from __future__ import annotations
 
+import io
 import os
 import pathlib
+import threading
 import time
 import warnings
-from typing import TYPE_CHECKING, BinaryIO, Callable
+from concurrent.futures import ThreadPoolExecutor
+from copy import deepcopy
+from typing import TYPE_CHECKING, Any, Callable, Iterable
 
 from ..exceptions import InvalidContentType, InvalidImageFile
-from ..utils import get_url_from_template
+from ..utils import get_url_from_template, run_in_executor
 
 if TYPE_CHECKING:
     import httpx
 
+_IMAGE_EXTENSIONS = (".qcow", ".qcow2", ".iol")
+_IMAGE_EXTENSION_SET = frozenset(_IMAGE_EXTENSIONS)
+_MAX_CONCURRENT_REQUESTS = 16
+_PROGRESS_MIN_BYTES = 1 << 20
+_PROGRESS_MIN_INTERVAL = 0.25
+
 
 class NodeImageDefinitions:
     _URL_TEMPLATES = {
@@ -40,12 +50,19 @@ class NodeImageDefinitions:
         "node_def": "node_definitions/{definition_id}",
         "image_def": "image_definitions/{definition_id}",
         "node_image_defs": "node_definitions/{definition_id}/image_definitions",
+        "node_def_read_only": "node_definitions/{definition_id}/read_only",
+        "image_def_read_only": "image_definitions/{definition_id}/read_only",
         "upload": "images/upload",
         "image_list": "list_image_definition_drop_folder/",
         "image_manage": "images/manage/{filename}",
     }
 
-    def __init__(self, session: httpx.Client) -> None:
+    def __init__(
+        self,
+        session: httpx.Client,
+        cache_size: int = 0,
+        cache_ttl: float | None = None,
+    ) -> None:
         """
         Manage node and image definitions.
 
@@ -53,9 +70,26 @@ class NodeImageDefinitions:
         Image definitions define disk images that are required to boot a network node.
         Together, they define a complete virtual network node.
 
+        Definition downloads can optionally be cached in memory by setting
+        `cache_size` to the number of responses to keep. The cache is cleared
+        whenever definitions are changed through this object; use `clear_cache`
+        after changing definitions in any other way, or set `cache_ttl` so that
+        changes made by other clients are picked up after that many seconds.
+
         :param session: The httpx-based HTTP client for this session with the server.
+        :param cache_size: The number of definition downloads to cache,
+            0 disables caching.
+        :param cache_ttl: The number of seconds a cached download stays valid,
+            None keeps it until it is evicted or the cache is cleared.
         """
         self._session = session
+        self._urls: dict[str, str] = {}
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+        self._cache: dict[str, tuple[float, Any]] = {}
+        self._cache_lock = threading.Lock()
+        # bumped on every clear, so responses fetched before a clear are not stored
+        self._cache_generation = 0
 
     def _url_for(self, endpoint, **kwargs):
         """
@@ -65,7 +99,48 @@ class NodeImageDefinitions:
         :param **kwargs: Keyword arguments used to format the URL.
         :returns: The formatted URL.
         """
-        return get_url_from_template(endpoint, self._URL_TEMPLATES, kwargs)
+        if kwargs:
+            return get_url_from_template(endpoint, self._URL_TEMPLATES, kwargs)
+        # URLs without arguments never change, build them once
+        url = self._urls.get(endpoint)
+        if url is None:
+            url = get_url_from_template(endpoint, self._URL_TEMPLATES)
+            self._urls[endpoint] = url
+        return url
+
+    def clear_cache(self) -> None:
+        """Drop all cached definition downloads."""
+        with self._cache_lock:
+            self._cache.clear()
+            self._cache_generation += 1
+
+    def _get(self, url: str) -> Any:
+        """
+        Helper function to GET a definition URL, using the cache if enabled.
+
+        :param url: The URL to request.
+        :returns: The decoded response.
+        """
+        if self.cache_size <= 0:
+            return self._session.get(url).json()
+        now = time.monotonic()
+        with self._cache_lock:
+            entry = self._cache.pop(url, None)
+            if entry is not None and (
+                self.cache_ttl is None or now - entry[0] < self.cache_ttl
+            ):
+                # move to the end, so the least recently used entry is first
+                self._cache[url] = entry
+                return deepcopy(entry[1])
+            generation = self._cache_generation
+        result = self._session.get(url).json()
+        with self._cache_lock:
+            # a change made during the request may have made the result outdated
+            if generation == self._cache_generation:
+                self._cache[url] = (now, result)
+                while len(self._cache) > self.cache_size:
+                    del self._cache[next(iter(self._cache))]
+        return deepcopy(result)
 
     def node_definitions(self) -> list[dict]:
         """
@@ -74,7 +149,7 @@ class NodeImageDefinitions:
         :returns: A list of node definitions.
         """
         url = self._url_for("node_defs")
-        return self._session.get(url).json()
+        return self._get(url)
 
     def image_definitions(self) -> list[dict]:
         """
@@ -83,7 +158,7 @@ class NodeImageDefinitions:
         :returns: A list of image definitions.
         """
         url = self._url_for("image_defs")
-        return self._session.get(url).json()
+        return self._get(url)
 
     def image_definitions_for_node_definition(self, definition_id: str) -> list[dict]:
         """
@@ -93,7 +168,7 @@ class NodeImageDefinitions:
         :returns: A list of image definition objects.
         """
         url = self._url_for("node_image_defs", definition_id=definition_id)
-        return self._session.get(url).json()
+        return self._get(url)
 
     def set_image_definition_read_only(
         self, definition_id: str, read_only: bool
@@ -105,8 +180,10 @@ class NodeImageDefinitions:
         :param read_only: The new value of the read-only attribute.
         :returns: The modified image definition.
         """
-        url = f"image_definitions/{definition_id}/read_only"
-        return self._session.put(url, json=read_only).json()
+        url = self._url_for("image_def_read_only", definition_id=definition_id)
+        response = self._session.put(url, json=read_only)
+        self.clear_cache()
+        return response.json()
 
     def set_node_definition_read_only(
         self, definition_id: str, read_only: bool
@@ -118,16 +195,18 @@ class NodeImageDefinitions:
         :param read_only: The new value of the read-only attribute.
         :returns: The modified node definition.
         """
-        url = f"node_definitions/{definition_id}/read_only"
-        return self._session.put(url, json=read_only).json()
+        url = self._url_for("node_def_read_only", definition_id=definition_id)
+        response = self._session.put(url, json=read_only)
+        self.clear_cache()
+        return response.json()
 
     def upload_node_definition(
-        self, body: str | dict, update: bool = False, json: bool | None = None
+        self, body: str | bytes | dict, update: bool = False, json: bool | None = None
     ) -> str:
         """
         Upload a new node definition.
 
-        :param body: The node definition (yaml or json).
+        :param body: The node definition (yaml as text or encoded bytes, or json).
         :param update: If creating a new node definition or updating an existing one.
         :param json: DEPRECATED: Replaced with type check.
         :returns: "Success".
@@ -144,18 +223,20 @@ class NodeImageDefinitions:
         url = self._url_for("node_defs")
         method = "PUT" if update else "POST"
         if is_json:
-            return self._session.request(method, url, json=body).json()
+            response = self._session.request(method, url, json=body)
         else:
             # YAML
-            return self._session.request(method, url, content=body).json()
+            response = self._session.request(method, url, content=body)
+        self.clear_cache()
+        return response.json()
 
     def upload_image_definition(
-        self, body: str | dict, update: bool = False, json: bool | None = None
+        self, body: str | bytes | dict, update: bool = False, json: bool | None = None
     ) -> str:
         """
         Upload a new image definition.
 
-        :param body: The image definition (yaml or json).
+        :param body: The image definition (yaml as text or encoded bytes, or json).
         :param update: If creating a new image definition or updating an existing one.
         :param json: DEPRECATED: Replaced with type check.
         :returns: "Success".
@@ -172,10 +253,12 @@ class NodeImageDefinitions:
         url = self._url_for("image_defs")
         method = "PUT" if update else "POST"
         if is_json:
-            return self._session.request(method, url, json=body).json()
+            response = self._session.request(method, url, json=body)
         else:
             # YAML
-            return self._session.request(method, url, content=body).json()
+            response = self._session.request(method, url, content=body)
+        self.clear_cache()
+        return response.json()
 
     def download_node_definition(self, definition_id: str) -> str:
         """
@@ -189,7 +272,7 @@ class NodeImageDefinitions:
         :returns: The node definition as YAML.
         """
         url = self._url_for("node_def", definition_id=definition_id)
-        return self._session.get(url).json()
+        return self._get(url)
 
     def download_image_definition(self, definition_id: str) -> str:
         """
@@ -203,20 +286,151 @@ class NodeImageDefinitions:
         :returns: The image definition as YAML.
         """
         url = self._url_for("image_def", definition_id=definition_id)
-        return self._session.get(url).json()
+        return self._get(url)
+
+    def download_node_definitions(self, definition_ids: Iterable[str]) -> dict:
+        """
+        Return the node definitions for several definition IDs.
+
+        The definitions are requested concurrently over the shared connection pool.
+
+        :param definition_ids: The IDs of the node definitions.
+        :returns: A dictionary mapping each ID to its node definition as YAML.
+        """
+        return self._get_many("node_def", definition_ids)
+
+    def download_image_definitions(self, definition_ids: Iterable[str]) -> dict:
+        """
+        Return the image definitions for several definition IDs.
+
+        The definitions are requested concurrently over the shared connection pool.
+
+        :param definition_ids: The IDs of the image definitions.
+        :returns: A dictionary mapping each ID to its image definition as YAML.
+        """
+        return self._get_many("image_def", definition_ids)
+
+    def image_definitions_for_node_definitions(
+        self, definition_ids: Iterable[str]
+    ) -> dict:
+        """
+        Return the image definitions for several node definitions.
+
+        The image definitions are requested concurrently over the shared
+        connection pool.
+
+        :param definition_ids: The IDs of the node definitions.
+        :returns: A dictionary mapping each node definition ID to a list of
+            its image definitions.
+        """
+        return self._get_many("node_image_defs", definition_ids)
+
+    async def node_definitions_async(self) -> list[dict]:
+        """
+        Return all node definitions without blocking the event loop.
+
+        :returns: A list of node definitions.
+        """
+        return await run_in_executor(self.node_definitions)
+
+    async def image_definitions_async(self) -> list[dict]:
+        """
+        Return all image definitions without blocking the event loop.
+
+        :returns: A list of image definitions.
+        """
+        return await run_in_executor(self.image_definitions)
+
+    async def image_definitions_for_node_definition_async(
+        self, definition_id: str
+    ) -> list[dict]:
+        """
+        Return all image definitions for a given node definition without blocking
+        the event loop.
+
+        :param definition_id: The ID of the node definition.
+        :returns: A list of image definition objects.
+        """
+        return await run_in_executor(
+            self.image_definitions_for_node_definition, definition_id
+        )
+
+    async def download_node_definition_async(self, definition_id: str) -> str:
+        """
+        Return the node definition with the given ID without blocking the event
+        loop, so that many definitions can be downloaded concurrently::
+
+            await asyncio.gather(
+                *(defs.download_node_definition_async(i) for i in definition_ids)
+            )
+
+        :param definition_id: The ID of the node definition.
+        :returns: The node definition as YAML.
+        """
+        return await run_in_executor(self.download_node_definition, definition_id)
+
+    async def download_image_definition_async(self, definition_id: str) -> str:
+        """
+        Return the image definition with the given ID without blocking the event loop.
+
+        :param definition_id: The ID of the image definition.
+        :returns: The image definition as YAML.
+        """
+        return await run_in_executor(self.download_image_definition, definition_id)
+
+    def _get_many(self, endpoint: str, definition_ids: Iterable[str]) -> dict:
+        """
+        Helper function to GET an endpoint for several definition IDs concurrently.
+
+        :param endpoint: The endpoint to request for each ID.
+        :param definition_ids: The definition IDs to format the endpoint with.
+        :returns: A dictionary mapping each ID to the decoded response.
+        """
+        definition_ids = list(dict.fromkeys(definition_ids))
+
+        def get(definition_id: str):
+            url = self._url_for(endpoint, definition_id=definition_id)
+            return self._get(url)
+
+        return dict(zip(definition_ids, _map_concurrently(get, definition_ids)))
+
+    def _delete_many(self, endpoint: str, field: str, values: Iterable[str]) -> None:
+        """
+        Helper function to DELETE an endpoint for several values concurrently.
+
+        :param endpoint: The endpoint to request for each value.
+        :param field: The name of the URL template field to fill in.
+        :param values: The values to format the endpoint with.
+        """
+        values = list(dict.fromkeys(values))
+
+        def delete(value: str):
+            url = self._url_for(endpoint, **{field: value})
+            self._session.delete(url)
+
+        try:
+            _map_concurrently(delete, values)
+        finally:
+            self.clear_cache()
 
     def upload_image_file(
         self,
         filename: str,
         rename: str | None = None,
+        progress_callback: Callable[[int, int, float], None] | None = None,
     ) -> None:
         """
         Upload an image file.
 
+        By default, the upload progress is printed to the standard output.
+
         :param filename: The path of the image to upload.
         :param rename: Optional filename to rename to.
+        :param progress_callback: Optional function that is called with the number
+            of bytes sent, the file size and the `time.monotonic()` start time
+            instead of printing the progress. Nothing is printed when a callback
+            is given.
         """
-        extension_list = [".qcow", ".qcow2", ".iol"]
         url = self._url_for("upload")
 
         path = pathlib.Path(filename)
@@ -227,45 +441,47 @@ class NodeImageDefinitions:
         if extension == "" or name == "":
             message = (
                 f"Name specified ({name}) is in wrong format "
-                f"(correct: filename.({'|'.join(extension_list)}) )."
+                f"(correct: filename.({'|'.join(_IMAGE_EXTENSIONS)}) )."
             )
             raise InvalidImageFile(message)
 
-        if extension not in extension_list and last_ext not in extension_list:
+        if (
+            extension not in _IMAGE_EXTENSION_SET
+            and last_ext not in _IMAGE_EXTENSION_SET
+        ):
             message = (
                 f"Extension in {name} not supported. "
-                f"(supported extensions are {', '.join(extension_list)})."
+                f"(supported extensions are {', '.join(_IMAGE_EXTENSIONS)})."
             )
             raise InvalidImageFile(message)
 
-        if not os.path.exists(filename):
+        try:
+            raw_file = open(filename, "rb", buffering=0)
+        except FileNotFoundError:
             message = f"File with specified name ({filename}) does not exist."
-            raise FileNotFoundError(message)
-
-        print(f"Uploading {name}")
+            raise FileNotFoundError(message) from None
+        verbose = progress_callback is None
+        if verbose:
+            progress_callback = print_progress_bar
         headers = {"X-Original-File-Name": name}
 
-        def callback_read_factory(
-            callback_file: BinaryIO, callback: Callable[[int, int, float], None]
-        ):
-            original_read = callback_file.read
-            callback_file.seek(0, os.SEEK_END)
-            size = callback_file.tell()
-            callback_file.seek(0)
-            start_time = time.time()
-
-            def callback_read(__n):
-                callback(callback_file.tell(), size, start_time)
-                return original_read(__n)
-
-            return callback_read
-
-        _file = open(filename, "rb")
-        _file.read = callback_read_factory(_file, print_progress_bar)
-        files = {"field0": (name, _file)}
-
-        self._session.post(url, files=files, headers=headers)
-        print("Upload completed")
+        # own the descriptor right away, so it is closed even if the calls below fail
+        with raw_file:
+            # stat the open file, so the size belongs to the file that is uploaded
+            size = os.fstat(raw_file.fileno()).st_size
+            if hasattr(os, "posix_fadvise"):
+                # the whole file is read once front to back, let the kernel read ahead
+                try:
+                    os.posix_fadvise(raw_file.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+                except OSError:
+                    pass
+            if verbose:
+                print(f"Uploading {name}")
+            with _ProgressReader(raw_file, size, progress_callback) as _file:
+                files = {"field0": (name, _file)}
+                self._session.post(url, files=files, headers=headers)
+        if verbose:
+            print("Upload completed")
 
     def download_image_file_list(self) -> list[str]:
         """
@@ -286,6 +502,16 @@ class NodeImageDefinitions:
         url = self._url_for("image_manage", filename=filename)
         return self._session.delete(url).json()
 
+    def remove_dropfolder_images(self, filenames: Iterable[str]) -> None:
+        """
+        Remove several image files from the drop folder.
+
+        The files are removed concurrently over the shared connection pool.
+
+        :param filenames: The names of the image files to remove.
+        """
+        self._delete_many("image_manage", "filename", filenames)
+
     def remove_node_definition(self, definition_id: str) -> None:
         """
         Remove the node definition with the given ID.
@@ -298,6 +524,7 @@ class NodeImageDefinitions:
         """
         url = self._url_for("node_def", definition_id=definition_id)
         self._session.delete(url)
+        self.clear_cache()
 
     def remove_image_definition(self, definition_id: str) -> None:
         """
@@ -311,6 +538,85 @@ class NodeImageDefinitions:
         """
         url = self._url_for("image_def", definition_id=definition_id)
         self._session.delete(url)
+        self.clear_cache()
+
+    def remove_node_definitions(self, definition_ids: Iterable[str]) -> None:
+        """
+        Remove the node definitions with the given IDs.
+
+        The definitions are removed concurrently over the shared connection pool.
+        Image definitions that reference a node definition must be removed first.
+
+        :param definition_ids: The IDs of the node definitions to remove.
+        """
+        self._delete_many("node_def", "definition_id", definition_ids)
+
+    def remove_image_definitions(self, definition_ids: Iterable[str]) -> None:
+        """
+        Remove the image definitions with the given IDs.
+
+        The definitions are removed concurrently over the shared connection pool.
+
+        :param definition_ids: The IDs of the image definitions to remove.
+        """
+        self._delete_many("image_def", "definition_id", definition_ids)
+
+
+class _ProgressReader(io.BufferedReader):
+    """
+    A buffered binary file reader that reports its progress while being read.
+
+    The callback is throttled to at most one call per `_PROGRESS_MIN_BYTES` read
+    or `_PROGRESS_MIN_INTERVAL` seconds, plus one call once the end is reached.
+    """
+
+    def __init__(
+        self,
+        raw: io.RawIOBase,
+        size: int,
+        callback: Callable[[int, int, float], None],
+    ) -> None:
+        """
+        :param raw: The unbuffered file to read from.
+        :param size: The size of the file.
+        :param callback: Called with the current position, the total size
+            and the `time.monotonic()` start time.
+        """
+        super().__init__(raw)
+        self._callback = callback
+        self._size = size
+        self._start_time = time.monotonic()
+        self._last_pos = -1
+        self._last_time = 0.0
+
+    def read(self, size: int | None = -1) -> bytes:
+        data = super().read(size)
+        pos = self.tell()
+        now = time.monotonic()
+        if pos != self._last_pos and (
+            pos == self._size
+            or pos - self._last_pos >= _PROGRESS_MIN_BYTES
+            or now - self._last_time >= _PROGRESS_MIN_INTERVAL
+        ):
+            self._last_pos = pos
+            self._last_time = now
+            self._callback(pos, self._size, self._start_time)
+        return data
+
+
+def _map_concurrently(func: Callable[[Any], Any], items: list) -> list:
+    """
+    Call a function for each item, using a thread pool for several items.
+
+    :param func: The function to call with each item.
+    :param items: The items to call the function with.
+    :returns: The results, in the order of the items.
+    """
+    if len(items) < 2:
+        return [func(item) for item in items]
+    workers = min(len(items), _MAX_CONCURRENT_REQUESTS)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(func, items))
 
 
 def print_progress_bar(cur: int, total: int, start_time: float, length=50) -> None:
@@ -319,16 +625,22 @@ def print_progress_bar(cur: int, total: int, start_time: float, length=50) -> No
 
     :param cur: The current progress value.
     :param total: The total progress value.
-    :param start_time: The start time of the progress.
+    :param start_time: The start time of the progress, from `time.monotonic()`.
     :param length: The length of the progress bar.
     """
-    percent = f"{100 * (cur / float(total)):.1f}"
-    filled_len = int(round(length * cur / float(total)))
+    if total:
+        percent = 100 * cur / total
+        filled_len = length * cur // total
+    else:
+        # an empty file is complete right away
+        percent = 100.0
+        filled_len = length
     bar = "#" * filled_len + "-" * (length - filled_len)
-    raw_elapsed = time.time() - start_time
-    elapsed = time.strftime("[%H:%M:%S]", time.gmtime(raw_elapsed))
+    minutes, seconds = divmod(int(time.monotonic() - start_time), 60)
+    hours, minutes = divmod(minutes, 60)
     print(
-        "\r |{}| {}/{} {}% {}".format(bar, cur, total, percent, elapsed),
+        f"\r |{bar}| {cur}/{total} {percent:.1f}% "
+        f"[{hours:02}:{minutes:02}:{seconds:02}]",
         end="",
         flush=True,
     )
@@ -336,16 +648,16 @@ def print_progress_bar(cur: int, total: int, start_time: float, length=50) -> No
         print()
 
 
-def _is_json_content(content: dict | str) -> bool:
+def _is_json_content(content: dict | str | bytes) -> bool:
     """
     Check if the content is JSON.
 
     :param content: The content to check.
-    :returns: True if the content is JSON, False otherwise.
+    :returns: True if the content is JSON, False if it is YAML text or bytes.
     :raises InvalidContentType: If the content type is invalid.
     """
     if isinstance(content, dict):
         return True
-    elif isinstance(content, str):
+    elif isinstance(content, (str, bytes)):
         return False
     raise InvalidContentType(type(content))
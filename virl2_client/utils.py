@@ -20,9 +20,11 @@
 
 from __future__ import annotations
 
+import asyncio
+import time
 from contextlib import nullcontext
-from functools import wraps
-from typing import TYPE_CHECKING, Callable, Type, TypeVar, Union, cast
+from functools import partial, wraps
+from typing import TYPE_CHECKING, Any, Callable, Iterator, Type, TypeVar, Union, cast
 
 import httpx
 
@@ -51,6 +53,7 @@ class _Sentinel:
 
 UNCHANGED = _Sentinel()
 _CONFIG_MODE = "exclude_configurations=false"
+_MIN_CONVERGENCE_DELAY = 0.1
 
 
 def _make_not_found(instance: Element) -> ElementNotFound:
@@ -178,3 +181,38 @@ def get_url_from_template(
         values = {}
     values["CONFIG_MODE"] = _CONFIG_MODE
     return endpoint_url_template.format(**values)
+
+
+def convergence_delays(max_iter: int, wait_time: float) -> Iterator[tuple[int, float]]:
+    """
+    Generate the attempt index and the time to sleep after each convergence check.
+
+    The delay starts short and doubles up to `wait_time`, so quick convergence
+    is detected early. Attempts continue until both `max_iter` checks were made
+    and `max_iter * wait_time` seconds have passed, which keeps the overall
+    time budget of a fixed-interval poll.
+
+    :param max_iter: The maximum number of iterations.
+    :param wait_time: The maximum time to wait between iterations.
+    :returns: An iterator of (attempt index, delay in seconds) tuples.
+    """
+    deadline = time.monotonic() + max_iter * wait_time
+    delay = min(_MIN_CONVERGENCE_DELAY, wait_time)
+    index = 0
+    while index < max_iter or time.monotonic() < deadline:
+        yield index, delay
+        index += 1
+        delay = min(delay * 2, wait_time)
+
+
+async def run_in_executor(func: Callable, *args, **kwargs) -> Any:
+    """
+    Run a blocking function in the default executor of the running event loop.
+
+    :param func: The function to run.
+    :param args: Positional arguments to be passed to `func`.
+    :param kwargs: Keyword arguments to be passed to `func`.
+    :returns: The return value of `func`.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, partial(func, *args, **kwargs))
@@ -203,6 +203,8 @@ class ClientLibrary:
         convergence_wait_max_iter: int = 500,
         convergence_wait_time: int | float = 5,
         events: bool = False,
+        definitions_cache_size: int = 0,
+        definitions_cache_ttl: float | None = None,
     ) -> None:
         """
         Initialize a ClientLibrary instance. Note that ssl_verify can
@@ -228,6 +230,10 @@ class ClientLibrary:
             synchronization from the server. When enabled, utilizes a mechanism for
             receiving real-time updates from the server, instead of periodically
             requesting the data.
+        :param definitions_cache_size: The number of node and image definition
+            downloads to cache in memory, 0 disables caching.
+        :param definitions_cache_ttl: The number of seconds a cached definition
+            download stays valid, None keeps it until it is evicted.
         :raises InitializationError: If no URL is provided, authentication fails or host
             can't be reached.
         """
@@ -267,7 +273,11 @@ class ClientLibrary:
         self.convergence_wait_time = convergence_wait_time
 
         self.allow_http = allow_http
-        self.definitions = NodeImageDefinitions(self._session)
+        self.definitions = NodeImageDefinitions(
+            self._session,
+            cache_size=definitions_cache_size,
+            cache_ttl=definitions_cache_ttl,
+        )
 
         self.url: str = url
         self.raise_for_auth_failure = raise_for_auth_failure